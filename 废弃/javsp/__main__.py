@@ -38,26 +38,27 @@ def setup_logging(log_level='INFO'):
     """设置日志级别"""
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
+    # 如果没有处理器，添加处理器（与所有抓取器共用的failed.log在同一次dictConfig中配置）
+    root_config = None
+    if not root_logger.handlers:
+        root_config = {
+            'formatters': {
+                'default': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'},
+            },
+            'handlers': {
+                # 控制台输出处理器
+                'console': {'class': 'logging.StreamHandler', 'stream': TqdmOut, 'formatter': 'default'},
+                # 文件输出处理器（logs目录由setup_failed_log确保存在）
+                'file': {'class': 'logging.FileHandler', 'filename': 'logs/javsp.log',
+                         'encoding': 'utf-8', 'formatter': 'default'},
+            },
+            'root': {'handlers': ['console', 'file']},
+        }
+    setup_failed_log(root_config)
+    
     # 设置根日志器级别
     root_logger.setLevel(numeric_level)
     
-    # 如果没有处理器，添加处理器
-    if not root_logger.handlers:
-        # 添加控制台输出处理器
-        console_handler = logging.StreamHandler(TqdmOut)
-        console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
-        
-        # 确保logs目录存在
-        os.makedirs('logs', exist_ok=True)
-        
-        # 添加文件输出处理器
-        file_handler = logging.FileHandler('logs/javsp.log', encoding='utf-8')
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
-    
     # 设置所有处理器的级别
     for handler in root_logger.handlers:
         handler.setLevel(numeric_level)
@@ -70,6 +71,7 @@ from javsp.func import *
 from javsp.image import *
 from javsp.datatype import Movie, MovieInfo
 from javsp.web.base import download
+from javsp.web.failed_log import setup_failed_log
 from javsp.web.exceptions import *
 
 from javsp.config import Cfg, CrawlerID
@@ -4,9 +4,15 @@ import csv
 import json
 import shutil
 import logging
-from functools import cached_property
 
-from javsp.config import Cfg
+# orjson是可选依赖：安装了时用来加速影片信息的序列化/反序列化
+try:
+    import orjson
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+
+from javsp.config import Cfg, MovieInfoField
 from javsp.lib import resource_path, detect_special_attr, is_folder_safe_to_delete
 
 
@@ -14,6 +20,9 @@ logger = logging.getLogger(__name__)
 filemove_logger = logging.getLogger('filemove')
 
 class MovieInfo:
+    # 可以从json文件中加载的字段（即__init__中创建的默认属性）
+    _PERSISTED_FIELDS = frozenset(i.value for i in MovieInfoField)
+
     def __init__(self, dvdid: str = None, /, *, cid: str = None, from_file=None):
         """
         Args:
@@ -60,7 +69,13 @@ class MovieInfo:
                 raise TypeError(f"Invalid file path: '{from_file}'")
 
     def __str__(self) -> str:
+        return self.to_json()
+
+    def to_json(self) -> str:
+        """将影片信息序列化为json字符串"""
         d = vars(self)
+        if orjson:
+            return orjson.dumps(d, option=_ORJSON_OPTIONS).decode('utf-8')
         return json.dumps(d, indent=2, ensure_ascii=False)
 
     def __repr__(self) -> str:
@@ -84,32 +99,39 @@ class MovieInfo:
                 filepath = os.path.join(os.path.dirname(__file__), filepath)
             else:
                 filepath = id + '.json'
-        with open(filepath, 'wt', encoding='utf-8') as f:
-            f.write(str(self))
+        # 先完整序列化再一次性写入，避免json.dump逐个片段地调用write
+        if orjson:
+            content = orjson.dumps(vars(self), option=_ORJSON_OPTIONS)
+        else:
+            content = self.to_json().encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(content)
 
     def load(self, filepath) -> None:
-        with open(filepath, 'rt', encoding='utf-8') as f:
-            d = json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        d = orjson.loads(raw) if orjson else json.loads(raw)
         # 更新对象属性
-        attrs = vars(self).keys()
         for k, v in d.items():
-            if k in attrs:
-                self.__setattr__(k, v)
+            if k in MovieInfo._PERSISTED_FIELDS:
+                setattr(self, k, v)
 
     def get_info_dic(self):
         """生成用来填充模板的字典"""
         info = self
+        summarizer = Cfg().summarizer
+        default = summarizer.default
         d = {}
         d['num'] = info.dvdid or info.cid
-        d['title'] = info.title or Cfg().summarizer.default.title
+        d['title'] = info.title or default.title
         d['rawtitle'] = info.ori_title or d['title']
-        d['actress'] = ','.join(info.actress) if info.actress else Cfg().summarizer.default.actress
+        d['actress'] = ','.join(info.actress) if info.actress else default.actress
         d['score'] = info.score or '0'
-        d['censor'] = Cfg().summarizer.censor_options_representation[1 if info.uncensored else 0]
-        d['serial'] = info.serial or Cfg().summarizer.default.series
-        d['director'] = info.director or Cfg().summarizer.default.director
-        d['producer'] = info.producer or Cfg().summarizer.default.producer
-        d['publisher'] = info.publisher or Cfg().summarizer.default.publisher
+        d['censor'] = summarizer.censor_options_representation[1 if info.uncensored else 0]
+        d['serial'] = info.serial or default.series
+        d['director'] = info.director or default.director
+        d['producer'] = info.producer or default.producer
+        d['publisher'] = info.publisher or default.publisher
         d['date'] = info.publish_date or '0000-00-00'
         d['year'] = d['date'].split('-')[0]
         # cid中不会出现'-'，可以直接从d['num']拆分出label
@@ -120,6 +142,27 @@ class MovieInfo:
         return d
 
 
+class _lazy_property:
+    """精简版的cached_property：首次访问时计算并写入实例的__dict__，之后的访问不再经过描述符
+
+    functools.cached_property在Python 3.12之前每次计算时都要获取锁，这里的属性只在单个线程中访问，无需加锁
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
 class Movie:
     """用于关联影片文件的类"""
     def __init__(self, dvdid=None, /, *, cid=None) -> None:
@@ -139,25 +182,30 @@ class Movie:
         self.poster_file = None         # poster文件的路径
         self.guid = None                # GUI使用的唯一标识，通过dvdid和files做md5生成
 
-    @cached_property
+    # hard_sub和uncensored在首次计算attr_str时就会被预先写入实例的__dict__，此后的访问通常不再经过描述符
+    @_lazy_property
     def hard_sub(self) -> bool:
         """影片文件带有内嵌字幕"""
         return 'C' in self.attr_str
 
-    @cached_property
+    @_lazy_property
     def uncensored(self) -> bool:
         """影片文件是无码流出/无码破解版本（很多种子并不严格区分这两种，故这里也不进一步细分）"""
         return 'U' in self.attr_str
 
-    @cached_property
+    @_lazy_property
     def attr_str(self) -> str:
         """用来标示影片文件的额外属性的字符串(空字符串/-U/-C/-UC)"""
         # 暂不支持多分片的影片
         if len(self.files) != 1:
-            return ''
-        r = detect_special_attr(self.files[0], self.dvdid)
-        if r:
-            r = '-' + r
+            r = ''
+        else:
+            r = detect_special_attr(self.files[0], self.dvdid)
+            if r:
+                r = '-' + r
+        # 使用setdefault：不覆盖已经直接赋值过的属性
+        self.__dict__.setdefault('hard_sub', 'C' in r)
+        self.__dict__.setdefault('uncensored', 'U' in r)
         return r
 
     def __repr__(self) -> str:
@@ -169,18 +217,29 @@ class Movie:
 
     def rename_files(self, use_hardlink: bool = False) -> None:
         """根据命名规则移动（重命名）影片文件"""
-        def move_file(src:str, dst:str) -> bool:
+        # 工作目录在整理过程中不会改变，只获取一次，避免abspath/relpath每次都调用getcwd
+        cwd = os.getcwd()
+        # 所有影片文件都会移动到同一个文件夹下，只需确保一次目标目录存在
+        dst_dir = os.path.dirname(os.path.normpath(os.path.join(cwd, self.save_dir, self.basename)))
+        os.makedirs(dst_dir, exist_ok=True)
+
+        def move_file(src:str, dst_name:str) -> bool:
             """移动（重命名）文件并记录信息到日志
             
+            Args:
+                src: 源文件路径
+                dst_name: 目标文件名（不含路径，文件将被移动到dst_dir下）
+
             Returns:
                 bool: True if file was moved, False if source was deleted due to duplicate
             """
-            abs_dst = os.path.abspath(dst)
-            abs_src = os.path.abspath(src)
+            abs_dst = os.path.join(dst_dir, dst_name)
+            abs_src = os.path.normpath(os.path.join(cwd, src))
+            src_rel = os.path.relpath(abs_src, cwd)
             
             # 如果目标文件已存在，删除源文件（当前正在处理的文件）
             if os.path.exists(abs_dst):
-                logger.info(f'目标文件已存在，删除当前文件: {os.path.relpath(src)}')
+                logger.info(f'目标文件已存在，删除当前文件: {src_rel}')
                 try:
                     os.remove(abs_src)
                     logger.debug(f'已删除重复的源文件: {abs_src}')
@@ -189,15 +248,10 @@ class Movie:
                     logger.error(f'删除重复文件失败: {abs_src}, 错误: {e}')
                     raise FileExistsError(f'目标文件已存在且无法删除源文件: {abs_dst}')
             
-            # 确保目标目录存在
-            os.makedirs(os.path.dirname(abs_dst), exist_ok=True)
-            
             if (use_hardlink):
                 os.link(src, abs_dst)
             else:
                 shutil.move(src, abs_dst)
-            src_rel = os.path.relpath(src)
-            dst_name = os.path.basename(dst)
             logger.info(f"重命名文件: '{src_rel}' -> '...{os.sep}{dst_name}'")
             # 目前StreamHandler并未设置filter，为了避免显示中出现重复的日志，这里暂时只能用debug级别
             filemove_logger.debug(f'移动（重命名）文件: \n  原路径: "{src}"\n  新路径: "{abs_dst}"')
@@ -205,17 +259,20 @@ class Movie:
 
         new_paths = []
         dir = os.path.dirname(self.files[0])
+        # basename中可能带有子目录，目标文件名只取其最后一部分
+        name_prefix = os.path.basename(self.basename)
         if len(self.files) == 1:
             fullpath = self.files[0]
             ext = os.path.splitext(fullpath)[1]
             newpath = os.path.join(self.save_dir, self.basename + ext)
-            if move_file(fullpath, newpath):
+            if move_file(fullpath, name_prefix + ext):
                 new_paths.append(newpath)
         else:
             for i, fullpath in enumerate(self.files, start=1):
                 ext = os.path.splitext(fullpath)[1]
-                newpath = os.path.join(self.save_dir, self.basename + f'-CD{i}' + ext)
-                if move_file(fullpath, newpath):
+                suffix = f'-CD{i}' + ext
+                newpath = os.path.join(self.save_dir, self.basename + suffix)
+                if move_file(fullpath, name_prefix + suffix):
                     new_paths.append(newpath)
         self.new_paths = new_paths
         
@@ -231,23 +288,17 @@ class Movie:
         try:
             # 使用配置中的视频扩展名
             video_extensions = Cfg().scanner.filename_extensions
-            can_delete, important_files = is_folder_safe_to_delete(folder_path, video_extensions)
+            # 完整的重要文件列表仅用于调试日志，不需要时发现第一个重要文件即可停止检查
+            full_check = logger.isEnabledFor(logging.DEBUG)
+            can_delete, important_files, deletable_files = is_folder_safe_to_delete(folder_path, video_extensions, early_exit=not full_check)
             
             if can_delete:
-                # 删除文件夹中的所有文件
-                for item in os.listdir(folder_path):
-                    item_path = os.path.join(folder_path, item)
+                # 删除文件夹中的所有文件（检查时已经得到了文件列表，无需再次遍历文件夹）
+                for item_path in deletable_files:
+                    item = os.path.basename(item_path)
                     try:
-                        if os.path.isfile(item_path):
-                            os.remove(item_path)
-                            logger.debug(f'删除文件: {item}')
-                        elif os.path.isdir(item_path):
-                            # 递归删除子目录（如果为空）
-                            try:
-                                os.rmdir(item_path)
-                                logger.debug(f'删除空子目录: {item}')
-                            except OSError:
-                                logger.debug(f'子目录非空，跳过: {item}')
+                        os.remove(item_path)
+                        logger.debug(f'删除文件: {item}')
                     except OSError as e:
                         logger.warning(f'删除文件失败: {item}, 错误: {e}')
                 
@@ -278,18 +329,27 @@ class GenreMap(dict):
     def __init__(self, file):
         genres = {}
         with open(resource_path(file), newline='', encoding='utf-8-sig') as csvfile:
-            reader = csv.DictReader(csvfile)
+            # 只需要其中两列，因此使用csv.reader按列序号取值，而不是为每一行都构造一个字典
+            reader = csv.reader(csvfile)
             try:
-                for row in reader:
-                    genres[row['id']] = row['translate']
+                header = next(reader, [])
+                try:
+                    id_col, translate_col = header.index('id'), header.index('translate')
+                except ValueError:
+                    logger.error("The columns 'id' and 'translate' must exist in the csv file")
+                else:
+                    for row in reader:
+                        if row:
+                            # 与DictReader一致：列数不足的行中缺少的值取None
+                            n = len(row)
+                            genres[row[id_col] if id_col < n else None] = row[translate_col] if translate_col < n else None
             except UnicodeDecodeError:
                 logger.error('CSV file must be saved as UTF-8-BOM to edit is in Excel')
-            except KeyError:
-                logger.error("The columns 'id' and 'translate' must exist in the csv file")
         self.update(genres)
 
     def map(self, ls):
         """将列表ls按照内置的映射进行替换：保留映射表中不存在的键，删除值为空的键"""
-        mapped = [self.get(i, i) for i in ls]
-        cleaned = [i for i in mapped if i]  # 译文为空表示此genre应当被删除
+        get = self.get
+        # 译文为空表示此genre应当被删除
+        cleaned = [v for v in map(get, ls, ls) if v]
         return cleaned
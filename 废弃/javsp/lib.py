@@ -2,17 +2,16 @@
 import os
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
 __all__ = ['re_escape', 'resource_path', 'strftime_to_minutes', 'detect_special_attr', 'truncate_filename', 'is_folder_safe_to_delete']
 
 
-_special_chars_map = {i: '\\' + chr(i) for i in b'()[]{}?*+|^$\\.'}
 def re_escape(s: str) -> str:
     """用来对字符串进行转义，以将转义后的字符串用于构造正则表达式"""
-    pattern = s.translate(_special_chars_map)
-    return pattern
+    return re.escape(s)
 
 
 def resource_path(path: str) -> str:
@@ -44,6 +43,12 @@ def strftime_to_minutes(s: str) -> int:
 
 
 _PATTERN = re.compile(r'(uncen(sor(ed)?)?([- _\s]*leak(ed)?)?|[无無][码碼](流出|破解))', flags=re.I)
+@lru_cache(maxsize=1024)
+def _avid_suffix_re(avid: str) -> re.Pattern:
+    """生成（并缓存）匹配番号后紧跟-C/-U/-UC后缀的正则表达式"""
+    return re.compile(re.sub(r'[_-]', '[_-]*', avid) + r'(UC|U|C)\b', flags=re.I)
+
+
 def detect_special_attr(filepath: str, avid: str = None) -> str:
     """通过文件名检测影片是否有特殊属性（内嵌字幕、无码流出/破解）
 
@@ -52,17 +57,15 @@ def detect_special_attr(filepath: str, avid: str = None) -> str:
     """
     result = ''
     base = os.path.splitext(os.path.basename(filepath))[0].upper()
-    # 尝试使用正则匹配
-    match = _PATTERN.search(base)
-    if match:
+    # 尝试使用正则匹配（_PATTERN的每个分支都必须包含下列字符串之一，不包含时无需执行正则匹配）
+    if ('UNCEN' in base or '无' in base or '無' in base) and _PATTERN.search(base):
         result += 'U'
-    # 尝试匹配-C/-U/-UC后缀的影片
-    postfix = base.split('-')[-1]
+    # 尝试匹配-C/-U/-UC后缀的影片（rpartition只查找最后一个'-'，无需像split那样切分出整个列表）
+    postfix = base.rpartition('-')[2]
     if postfix in ('U', 'C', 'UC'):
         result += postfix
     elif avid:
-        pattern_str = re.sub(r'[_-]', '[_-]*', avid) + r'(UC|U|C)\b'
-        match = re.search(pattern_str, base, flags=re.I)
+        match = _avid_suffix_re(avid).search(base)
         if match:
             result += match.group(1)
     # 最终格式化
@@ -70,6 +73,25 @@ def detect_special_attr(filepath: str, avid: str = None) -> str:
     return result
 
 
+def _truncate_utf8(s: str, max_bytes: int) -> str:
+    """将字符串按UTF-8编码截断到不超过max_bytes字节，且不会在多字节字符中间截断"""
+    data = s.encode('utf-8')[:max_bytes]
+    # 回退到最后一个字符的起始字节（UTF-8的后续字节均形如0b10xxxxxx）
+    start = len(data) - 1
+    while start >= 0 and (data[start] & 0xC0) == 0x80:
+        start -= 1
+    if start >= 0:
+        lead = data[start]
+        char_len = 1 if lead < 0x80 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        # 最后一个字符不完整时将其整个丢弃
+        if start + char_len > len(data):
+            data = data[:start]
+    return data.decode('utf-8')
+
+
+# 截断文件名时优先作为断点的标点符号
+_PUNCTUATION_CHARS = '。！？；，、：""''（）【】《》〈〉…·～—-_=+|\\/*&^%$#@'
+_PUNCT_PART = re.compile('[^{0}]*[{0}]|[^{0}]+'.format(re.escape(_PUNCTUATION_CHARS)))
 def truncate_filename(filename: str, max_length: int, by_byte: bool = False, preserve_ext: bool = True) -> str:
     """智能截断文件名以符合长度限制
     
@@ -107,44 +129,25 @@ def truncate_filename(filename: str, max_length: int, by_byte: bool = False, pre
             return truncated_ext
         return ""
     
-    # 优先在标点符号处截断，保持语义完整性
-    punctuation_chars = '。！？；，、：""''（）【】《》〈〉…·～—-_=+|\\/*&^%$#@'
-    
-    # 先按标点符号分割
-    parts = []
-    current_part = ""
-    
-    for char in base_name:
-        current_part += char
-        if char in punctuation_chars:
-            parts.append(current_part)
-            current_part = ""
-    
-    if current_part:
-        parts.append(current_part)
+    # 优先在标点符号处截断，保持语义完整性：先按标点符号分割（标点保留在所在片段的末尾）
+    parts = _PUNCT_PART.findall(base_name)
     
     # 从后往前移除部分，直到长度符合要求
+    # 每个片段只计算一次长度并累加，避免反复对整个拼接结果重新编码
     result = ""
+    result_length = 0
     for part in parts:
-        test_result = result + part
-        if get_length(test_result) <= available_length:
-            result = test_result
+        part_length = get_length(part)
+        if result_length + part_length <= available_length:
+            result += part
+            result_length += part_length
         else:
             # 如果添加当前部分会超长，尝试只添加部分内容
-            remaining_length = available_length - get_length(result)
+            remaining_length = available_length - result_length
             if remaining_length > 0:
                 if by_byte:
                     # 按字节截断
-                    part_bytes = part.encode('utf-8')
-                    truncated_bytes = part_bytes[:remaining_length]
-                    # 确保不在多字节字符中间截断
-                    while truncated_bytes:
-                        try:
-                            truncated_bytes.decode('utf-8')
-                            break
-                        except UnicodeDecodeError:
-                            truncated_bytes = truncated_bytes[:-1]
-                    result += truncated_bytes.decode('utf-8', errors='ignore')
+                    result += _truncate_utf8(part, remaining_length)
                 else:
                     # 按字符截断
                     result += part[:remaining_length]
@@ -153,33 +156,51 @@ def truncate_filename(filename: str, max_length: int, by_byte: bool = False, pre
     # 如果仍然为空或者截断结果不够理想，使用简单截断
     if not result or get_length(result) > available_length:
         if by_byte:
-            result_bytes = base_name.encode('utf-8')[:available_length]
-            # 确保不在多字节字符中间截断
-            while result_bytes:
-                try:
-                    result_bytes.decode('utf-8')
-                    break
-                except UnicodeDecodeError:
-                    result_bytes = result_bytes[:-1]
-            result = result_bytes.decode('utf-8', errors='ignore')
+            result = _truncate_utf8(base_name, available_length)
         else:
             result = base_name[:available_length]
     
     return result + ext
 
 
-def is_folder_safe_to_delete(folder_path: str, keep_video_extensions: list = None) -> tuple[bool, list[str]]:
+# 可以删除的文件类型（图片、元数据、字幕等）
+_DELETABLE_EXT = frozenset({
+    # 图片文件
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp',
+    # 元数据和信息文件
+    '.nfo', '.xml', '.txt', '.json', '.db', '.ini', '.log',
+    # 字幕文件
+    '.srt', '.ass', '.ssa', '.vtt', '.sub', '.idx', '.sup',
+    # 其他常见的非重要文件
+    '.url', '.lnk', '.torrent', '.magnet', '.md5', '.sha1',
+    # 临时文件
+    '.tmp', '.temp', '.bak', '.old', '.~', '.swp',
+    # 系统文件
+    '.ds_store', 'thumbs.db', 'desktop.ini',
+})
+
+# 可以删除的特殊文件名（不区分大小写）
+_DELETABLE_NAMES = frozenset({
+    'thumbs.db', 'desktop.ini', '.ds_store', 'folder.jpg', 'folder.png',
+    'cover.jpg', 'cover.png', 'poster.jpg', 'poster.png', 'fanart.jpg',
+    'fanart.png', 'background.jpg', 'background.png', 'banner.jpg',
+    'banner.png', 'logo.jpg', 'logo.png', 'movie.nfo', 'tvshow.nfo',
+    'season.nfo', 'episode.nfo'
+})
+
+def is_folder_safe_to_delete(folder_path: str, keep_video_extensions: list = None, early_exit: bool = True) -> tuple[bool, list[str], list[str]]:
     """判断文件夹是否可以安全删除（只包含图片、元数据等可删除文件）
     
     Args:
         folder_path: 要检查的文件夹路径
         keep_video_extensions: 需要保留的视频文件扩展名列表，如果为None则使用默认列表
+        early_exit: 是否在发现第一个重要文件后立即停止检查（此时重要文件列表中只有这一个文件）
         
     Returns:
-        tuple[bool, list[str]]: (是否可以安全删除, 重要文件列表)
+        tuple[bool, list[str], list[str]]: (是否可以安全删除, 重要文件列表, 可删除文件的路径列表)
     """
     if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
-        return True, []
+        return True, [], []
     
     # 默认的视频文件扩展名（需要保留的重要文件）
     if keep_video_extensions is None:
@@ -188,75 +209,59 @@ def is_folder_safe_to_delete(folder_path: str, keep_video_extensions: list = Non
             '.mov', '.mp4', '.mpeg', '.rm', '.rmvb', '.ts', '.vob', '.webm', 
             '.wmv', '.strm', '.mpg'
         ]
-    
-    # 可以删除的文件类型（图片、元数据、字幕等）
-    deletable_extensions = {
-        # 图片文件
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp',
-        # 元数据和信息文件
-        '.nfo', '.xml', '.txt', '.json', '.db', '.ini', '.log',
-        # 字幕文件
-        '.srt', '.ass', '.ssa', '.vtt', '.sub', '.idx', '.sup',
-        # 其他常见的非重要文件
-        '.url', '.lnk', '.torrent', '.magnet', '.md5', '.sha1',
-        # 临时文件
-        '.tmp', '.temp', '.bak', '.old', '.~', '.swp',
-        # 系统文件
-        '.ds_store', 'thumbs.db', 'desktop.ini',
-    }
-    
-    # 可以删除的特殊文件名（不区分大小写）
-    deletable_filenames = {
-        'thumbs.db', 'desktop.ini', '.ds_store', 'folder.jpg', 'folder.png',
-        'cover.jpg', 'cover.png', 'poster.jpg', 'poster.png', 'fanart.jpg',
-        'fanart.png', 'background.jpg', 'background.png', 'banner.jpg',
-        'banner.png', 'logo.jpg', 'logo.png', 'movie.nfo', 'tvshow.nfo',
-        'season.nfo', 'episode.nfo'
-    }
+    keep_set = frozenset(e.lower() for e in keep_video_extensions)
     
     important_files = []
+    deletable_files = []
     
     try:
-        for item in os.listdir(folder_path):
-            item_path = os.path.join(folder_path, item)
-            
-            # 跳过子目录（暂不处理嵌套目录）
-            if os.path.isdir(item_path):
-                important_files.append(f"子目录: {item}")
-                continue
-            
-            item_lower = item.lower()
-            _, ext = os.path.splitext(item_lower)
-            
-            # 检查是否是需要保留的视频文件
-            if ext in [e.lower() for e in keep_video_extensions]:
-                important_files.append(f"视频文件: {item}")
-                continue
-            
-            # 检查是否是可删除的文件类型
-            if ext in deletable_extensions:
-                continue
+        # scandir在遍历时即可得到文件类型等信息，避免对每个条目再单独调用isdir/getsize
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if early_exit and important_files:
+                    break
+                item = entry.name
+                
+                # 跳过子目录（暂不处理嵌套目录）
+                if entry.is_dir():
+                    important_files.append(f"子目录: {item}")
+                    continue
+                
+                item_lower = item.lower()
+                _, ext = os.path.splitext(item_lower)
                 
-            # 检查是否是可删除的特殊文件名
-            if item_lower in deletable_filenames:
-                continue
-            
-            # 检查文件大小，如果很小可能是元数据文件
-            try:
-                file_size = os.path.getsize(item_path)
-                if file_size < 1024 * 10:  # 小于10KB的文件可能是元数据
+                # 检查是否是需要保留的视频文件
+                if ext in keep_set:
+                    important_files.append(f"视频文件: {item}")
                     continue
-            except OSError:
-                pass
-            
-            # 其他未识别的文件视为重要文件
-            important_files.append(f"未知文件: {item}")
+                
+                # 检查是否是可删除的文件类型
+                if ext in _DELETABLE_EXT:
+                    deletable_files.append(entry.path)
+                    continue
+                    
+                # 检查是否是可删除的特殊文件名
+                if item_lower in _DELETABLE_NAMES:
+                    deletable_files.append(entry.path)
+                    continue
+                
+                # 检查文件大小，如果很小可能是元数据文件
+                try:
+                    file_size = entry.stat().st_size
+                    if file_size < 1024 * 10:  # 小于10KB的文件可能是元数据
+                        deletable_files.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+                
+                # 其他未识别的文件视为重要文件
+                important_files.append(f"未知文件: {item}")
     
     except OSError as e:
-        return False, [f"访问目录失败: {e}"]
+        return False, [f"访问目录失败: {e}"], []
     
     # 如果没有重要文件，则可以安全删除
-    return len(important_files) == 0, important_files
+    return len(important_files) == 0, important_files, deletable_files
 
 
 if __name__ == "__main__":
@@ -4,9 +4,11 @@ import re
 import logging
 import requests
 from urllib.parse import urljoin
+from lxml import etree
 
 from javsp.web.base import *
 from javsp.web.exceptions import *
+from javsp.web.failed_log import FAILED_LOGGER_NAME, setup_failed_log
 from javsp.func import *
 from javsp.config import Cfg
 from javsp.datatype import MovieInfo
@@ -14,18 +16,27 @@ from javsp.datatype import MovieInfo
 
 logger = logging.getLogger(__name__)
 
-# 配置失败日志记录器
-failed_logger = logging.getLogger('avwiki_failed')
-#os.makedirs('logs', exist_ok=True)
-failed_handler = logging.FileHandler('logs/failed.log', encoding='utf-8')
-failed_formatter = logging.Formatter('%(asctime)s - %(message)s')
-failed_handler.setFormatter(failed_formatter)
-failed_logger.addHandler(failed_handler)
-failed_logger.setLevel(logging.INFO)
-failed_logger.propagate = False  # 防止日志传播到父记录器
+# 失败日志记录器（处理器由程序启动时的setup_failed_log统一配置）
+failed_logger = logging.getLogger(f'{FAILED_LOGGER_NAME}.avwiki')
 
 permanent_url = 'https://av-wiki.net'
 
+# 预编译解析页面所用的XPath表达式
+_XP_PAGE_TITLE = etree.XPath('//title/text()')
+_XP_TITLE = etree.XPath('//h1/text()')
+_XP_COVER = etree.XPath('//img[contains(@src, "dmm.co.jp") or contains(@src, "mgstage.com")]/@src')
+_XP_CONTENT = etree.XPath('//div[@class="entry-content"]')
+
+# 预编译解析页面所用的正则表达式
+_TITLE_SUFFIX_1 = re.compile(r'に出てる.*$')
+_TITLE_SUFFIX_2 = re.compile(r'まとめ$')
+_ACTOR_SPLIT = re.compile(r'[とと、,]')
+_PRODUCER_RE = re.compile(r'メーカー[：:]\s*([^\n]+)')
+_DATE_RE = re.compile(r'配信開始日[：:]?\s*(\d{4}-\d{1,2}-\d{1,2})')
+_SERIES_RE = re.compile(r'シリーズ[：:]\s*([^\n]+)')
+# 包含这些字符串的部分明显不是人名（合并为一个正则，只需扫描一遍）
+_BAD_ACTOR_RE = re.compile('|'.join(map(re.escape, ('AV', '女優', 'まとめ', 'LUXU', 'MIUM', 'GANA', 'SIRO', 'ABP', 'SSIS'))))
+
 
 def parse_data(movie: MovieInfo):
     """从AV-Wiki网页抓取并解析指定番号的数据
@@ -53,39 +64,40 @@ def parse_data(movie: MovieInfo):
         html = resp2html(resp)
         
         # 检查是否找到页面
-        page_title = html.xpath('//title/text()')
+        page_title = _XP_PAGE_TITLE(html)
         if page_title and ('404' in page_title[0] or 'Not Found' in page_title[0]):
             logger.debug(f'avwiki: 番号 {dvdid} 未找到（正常现象）')
             # 404 是正常现象，不记录到失败日志
             raise MovieNotFoundError(__name__, dvdid)
         
         # 提取标题 - 从h1标签获取
-        title_elements = html.xpath('//h1/text()')
+        title_elements = _XP_TITLE(html)
         if title_elements:
             title = title_elements[0]
             # 清理标题，去掉"に出てるAV女優名まとめ"等后缀
-            title = re.sub(r'に出てる.*$', '', title)
-            title = re.sub(r'まとめ$', '', title)
+            title = _TITLE_SUFFIX_1.sub('', title)
+            title = _TITLE_SUFFIX_2.sub('', title)
             movie.title = title.strip()
         
         # 提取封面图片
-        cover_elements = html.xpath('//img[contains(@src, "dmm.co.jp") or contains(@src, "mgstage.com")]/@src')
+        cover_elements = _XP_COVER(html)
         if cover_elements:
             movie.cover = cover_elements[0]
         
         # 提取演员信息 - 从页面内容中查找
-        content_text = ' '.join(html.xpath('//div[@class="entry-content"]//text()'))
+        # text_content()在lxml内部拼接文本，无需先构建包含每个文本节点的列表再拼接
+        content_text = ' '.join(node.text_content() for node in _XP_CONTENT(html))
         
         # 查找演员名单
         actress_list = []
         # 从页面标题中提取演员名 (格式: "演员A与演员B与演员C")
         if movie.title:
             # 处理日文中的"と"连接符
-            actors_in_title = re.split(r'[とと、,]', movie.title)
+            actors_in_title = _ACTOR_SPLIT.split(movie.title)
             for actor in actors_in_title:
                 actor = actor.strip()
                 # 过滤掉明显不是人名的部分
-                if len(actor) >= 2 and not any(x in actor for x in ['AV', '女優', 'まとめ', 'LUXU', 'MIUM', 'GANA', 'SIRO', 'ABP', 'SSIS']):
+                if len(actor) >= 2 and not _BAD_ACTOR_RE.search(actor):
                     actress_list.append(actor)
         
         if actress_list:
@@ -94,17 +106,17 @@ def parse_data(movie: MovieInfo):
         # 从页面内容中提取制作信息
         if content_text:
             # 提取制作商信息
-            producer_match = re.search(r'メーカー[：:]\s*([^\\n]+)', content_text)
+            producer_match = _PRODUCER_RE.search(content_text)
             if producer_match:
                 movie.producer = producer_match.group(1).strip()
             
             # 提取发布日期
-            date_match = re.search(r'配信開始日[：:]?\s*(\d{4}-\d{1,2}-\d{1,2})', content_text)
+            date_match = _DATE_RE.search(content_text)
             if date_match:
                 movie.publish_date = date_match.group(1)
             
             # 提取系列信息
-            series_match = re.search(r'シリーズ[：:]\s*([^\\n]+)', content_text)
+            series_match = _SERIES_RE.search(content_text)
             if series_match:
                 movie.serial = series_match.group(1).strip()
         
@@ -148,8 +160,12 @@ if __name__ == "__main__":
     import pretty_errors
     pretty_errors.configure(display_link=True)
     
-    # 配置日志级别
-    logging.basicConfig(level=logging.DEBUG)
+    # 配置日志级别（控制台输出与failed.log一并配置）
+    setup_failed_log({
+        'formatters': {'basic': {'format': logging.BASIC_FORMAT}},
+        'handlers': {'console': {'class': 'logging.StreamHandler', 'formatter': 'basic'}},
+        'root': {'level': 'DEBUG', 'handlers': ['console']},
+    })
     
     # 测试用例
     movie = MovieInfo('SSIS-698')
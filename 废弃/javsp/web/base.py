@@ -6,6 +6,7 @@ import shutil
 import logging
 import requests
 import contextlib
+from functools import lru_cache
 import cloudscraper
 import lxml.html
 from tqdm import tqdm
@@ -27,11 +28,20 @@ logger = logging.getLogger(__name__)
 # 删除js脚本相关的tag，避免网页检测到没有js运行环境时强行跳转，影响调试
 cleaner = Cleaner(kill_tags=['script', 'noscript'])
 
-def read_proxy():
+@lru_cache(maxsize=1)
+def _proxy_server() -> str | None:
+    """读取配置的代理服务器（运行期间不会改变，只需读取一次）"""
     if Cfg().network.proxy_server is None:
+        return None
+    return str(Cfg().network.proxy_server)
+
+
+def read_proxy():
+    # 每次返回新的dict：requests会将环境变量中的代理合并到传入的proxies中，共用同一个dict会相互影响
+    proxy = _proxy_server()
+    if proxy is None:
         return {}
     else:
-        proxy = str(Cfg().network.proxy_server)
         return {'http': proxy, 'https': proxy}
 
 # 与网络请求相关的功能汇总到一个模块中以方便处理，但是不同站点的抓取器又有自己的需求（针对不同网站
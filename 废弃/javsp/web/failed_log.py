@@ -0,0 +1,78 @@
+"""记录抓取失败信息的日志（logs/failed.log）"""
+import os
+import queue
+import atexit
+import logging
+import logging.config
+from logging.handlers import QueueHandler, QueueListener
+
+
+__all__ = ['FAILED_LOGGER_NAME', 'setup_failed_log']
+
+
+# 各个抓取器使用此记录器的子记录器（如'javsp.failed.javbus2'）记录抓取失败的信息
+FAILED_LOGGER_NAME = 'javsp.failed'
+
+# 未调用setup_failed_log的入口（如单独运行某个抓取器）中，失败信息既不写入文件，也不传播到根记录器输出到控制台
+_failed_logger = logging.getLogger(FAILED_LOGGER_NAME)
+_failed_logger.propagate = False
+_failed_logger.addHandler(logging.NullHandler())
+
+
+def _queue_handler_factory(filename: str) -> QueueHandler:
+    """创建写入failed.log的处理器：由后台线程负责实际的写入，抓取线程中记录日志只需要将记录放入队列"""
+    # delay=True: 直到第一次写入时才打开文件，没有抓取失败时不会占用文件句柄
+    file_handler = logging.FileHandler(filename, encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    failed_queue = queue.Queue(-1)
+    listener = QueueListener(failed_queue, file_handler)
+    listener.start()
+    # 退出前处理完队列中剩余的记录
+    atexit.register(listener.stop)
+    return QueueHandler(failed_queue)
+
+
+_LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,  # 不要影响已经创建的其他记录器
+    'handlers': {
+        'failed_file': {
+            '()': _queue_handler_factory,
+            'filename': 'logs/failed.log',
+        },
+    },
+    'loggers': {
+        FAILED_LOGGER_NAME: {
+            'handlers': ['failed_file'],
+            'level': 'INFO',
+            'propagate': False,  # 防止日志传播到父记录器
+        },
+    },
+}
+
+
+# 是否已经完成配置（重复配置会再启动一个后台写入线程）
+_configured = False
+
+
+def setup_failed_log(extra_config: dict = None):
+    """配置failed.log的日志处理器（所有抓取器共用），重复调用时不会再次配置
+
+    非增量的dictConfig会关闭此前已经创建的所有日志处理器，因此其他需要的处理器（如根记录器的控制台和文件处理器）
+    应当通过extra_config在同一次配置中给出，而不是事先添加
+
+    Args:
+        extra_config (dict, optional): 合并到日志配置中的额外配置（dictConfig格式，支持formatters、handlers和root）
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    os.makedirs('logs', exist_ok=True)
+    config = dict(_LOGGING_CONFIG)
+    if extra_config:
+        for key in ('formatters', 'handlers'):
+            config[key] = {**config.get(key, {}), **extra_config.get(key, {})}
+        if 'root' in extra_config:
+            config['root'] = extra_config['root']
+    logging.config.dictConfig(config)
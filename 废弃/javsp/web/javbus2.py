@@ -1,76 +1,160 @@
 """增强版JavBus爬虫 - 解决SSL连接问题并提供更强的网络稳定性"""
 import re
 import ssl
+import sys
 import time
 import random
 import logging
+import threading
+import certifi
 import requests
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
-from urllib3 import disable_warnings
-from urllib3.exceptions import InsecureRequestWarning
+import lxml.html
+from lxml import etree
 
 from javsp.web.base import *
 from javsp.web.exceptions import *
+from javsp.web.failed_log import FAILED_LOGGER_NAME, setup_failed_log
 from javsp.func import *
 from javsp.config import Cfg, CrawlerID
 from javsp.datatype import MovieInfo, GenreMap
 
 
-# 禁用SSL警告
-disable_warnings(InsecureRequestWarning)
-
 logger = logging.getLogger(__name__)
 
-# 配置失败日志记录器
-failed_logger = logging.getLogger('javbus2_failed')
-#os.makedirs('logs', exist_ok=True)
-failed_handler = logging.FileHandler('logs/failed.log', encoding='utf-8')
-failed_formatter = logging.Formatter('%(asctime)s - %(message)s')
-failed_handler.setFormatter(failed_formatter)
-failed_logger.addHandler(failed_handler)
-failed_logger.setLevel(logging.INFO)
-failed_logger.propagate = False  # 防止日志传播到父记录器
+# 失败日志记录器（处理器由程序启动时的setup_failed_log统一配置）
+failed_logger = logging.getLogger(f'{FAILED_LOGGER_NAME}.javbus2')
 
 genre_map = GenreMap('data/genre_javbus.csv')
 permanent_url = 'https://www.javbus.com'
 
 # 多个User-Agent轮换，增强反爬虫能力
-USER_AGENTS = [
+USER_AGENTS = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-]
+)
+
+# 除User-Agent外固定不变的请求头，只创建一次（使用只读映射防止被意外修改）
+_HEADER_TEMPLATE = MappingProxyType({
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+})
 
 # 直接使用永久URL，不再使用proxy_free功能
 base_url = permanent_url
 
+# 网络配置在运行期间不会改变，导入时读取一次即可，避免每次请求都经由Cfg()逐级查找
+_RETRY = Cfg().network.retry
+_TIMEOUT = Cfg().network.timeout.total_seconds()
+
+# 批量抓取时的最大并发数，连接池的大小与之保持一致，避免并发线程因没有空闲连接而反复新建连接
+MAX_WORKERS = 8
+# 批量抓取时两次请求之间的最小间隔（秒），避免并发请求过于密集而被网站封禁
+MIN_REQUEST_INTERVAL = 0.5
+
+# 边接收边解析网页时每次读取的字节数
+_STREAM_CHUNK_SIZE = 8192
+
+# 预编译解析页面所用的XPath表达式
+_XP_PAGE_TITLE = etree.XPath('/html/head/title/text()')
+_XP_CONTAINER = etree.XPath("//div[@class='container']")
+_XP_TITLE = etree.XPath("h3/text()")
+_XP_COVER = etree.XPath("//a[@class='bigImage']/img/@src")
+_XP_PREVIEW_PICS = etree.XPath("//div[@id='sample-waterfall']/a/@href")
+_XP_INFO = etree.XPath("//div[@class='col-md-3 info']")
+_XP_GENRE = etree.XPath("//span[@class='genre']/label/a")
+_XP_ACTRESS = etree.XPath("//a[@class='avatar-box']/div/img")
+
+
+# 共用的SSL上下文中预先加载的CA证书文件
+_CA_BUNDLE = certifi.where()
+
+
+def _create_ssl_context():
+    """创建启用了证书验证的SSL上下文（使用certifi提供的CA证书）"""
+    ssl_context = ssl.create_default_context(cafile=_CA_BUNDLE)
+    
+    # 设置支持的SSL协议版本
+    ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
+    ssl_context.maximum_version = ssl.TLSVersion.TLSv1_3
+    return ssl_context
+
+
+# 所有连接共用同一个SSL上下文，避免urllib3为每个新连接重新创建上下文并加载证书
+shared_ssl_context = _create_ssl_context()
+
+
+class SSLContextAdapter(HTTPAdapter):
+    """将指定的SSL上下文传递给urllib3连接池（包括经由代理的连接池）的HTTP适配器"""
+    
+    def __init__(self, ssl_context, **kwargs):
+        # 必须在父类__init__之前赋值，因为父类__init__中会调用init_poolmanager
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+    
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+    
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        # certifi的CA证书已经加载到共用的SSL上下文中，不再让urllib3在每次新建连接时重新加载；
+        # 用户通过verify或REQUESTS_CA_BUNDLE等环境变量指定了其他CA证书（如代理使用自签名证书）时，仍交由urllib3加载
+        if conn.ca_certs == _CA_BUNDLE:
+            conn.ca_certs = None
+
 
 class EnhancedSession:
     """增强的会话类，提供更强的SSL处理和重试机制"""
     
     def __init__(self):
         self.session = requests.Session()
+        self._timeout = _TIMEOUT
+        self._connection_tested = False
         self._setup_session()
-        self._setup_ssl_context()
     
     def _setup_session(self):
         """配置会话的重试策略和适配器"""
-        # 配置重试策略
+        # 配置重试策略：所有重试都在这一层完成，get_with_retry中不再另外循环重试，以免重试次数和等待时间成倍叠加
         retry_strategy = Retry(
-            total=Cfg().network.retry,
+            total=_RETRY,
+            connect=_RETRY,  # 连接错误（包括SSL握手失败）
+            read=_RETRY,
+            status=_RETRY,
             backoff_factor=1.5,  # 指数退避
+            backoff_max=30,
+            backoff_jitter=1.0,  # 为退避时间加入随机抖动，避免多个线程的重试请求在同一时刻集中发出
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False  # 重试耗尽后返回最后一次的响应，由get_with_retry根据状态码抛出对应的异常
         )
         
         # 配置HTTP适配器
-        adapter = HTTPAdapter(
+        # requests/urllib3（当前锁定的2.2.x版本）只支持HTTP/1.1，无法像HTTP/2那样在单个连接上多路复用请求，
+        # 因此整个进程共用这一个会话，由连接池保持长连接，使TLS握手只在新建连接时发生
+        adapter = SSLContextAdapter(
+            shared_ssl_context,
             max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10,
+            pool_connections=MAX_WORKERS,
+            pool_maxsize=MAX_WORKERS,
             pool_block=False
         )
         
@@ -78,44 +162,16 @@ class EnhancedSession:
         self.session.mount("https://", adapter)
         
         # 设置基础配置
-        self.session.timeout = Cfg().network.timeout.total_seconds()
+        self.session.timeout = self._timeout
         self.session.proxies = read_proxy()
     
-    def _setup_ssl_context(self):
-        """配置SSL上下文以处理SSL连接问题"""
-        # 创建自定义SSL上下文
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # 设置支持的SSL协议版本
-        ssl_context.minimum_version = ssl.TLSVersion.TLSv1_2
-        ssl_context.maximum_version = ssl.TLSVersion.TLSv1_3
-        
-        # 设置加密套件
-        ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
-        
-        # 应用SSL上下文到会话
-        self.session.verify = False
-    
     def get_random_headers(self):
         """获取随机User-Agent和其他头部"""
-        return {
-            'User-Agent': random.choice(USER_AGENTS),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0',
-        }
+        return {'User-Agent': random.choice(USER_AGENTS), **_HEADER_TEMPLATE}
     
     def test_connection(self, url=None):
         """测试网络连接和代理状态"""
-        test_url = url or f'{permanent_url}/test'
+        test_url = url or permanent_url
         try:
             response = self.session.get(
                 test_url,
@@ -127,93 +183,59 @@ class EnhancedSession:
         except Exception as e:
             return False, str(e)
 
-    def get_with_retry(self, url, max_attempts=None):
-        """带重试的GET请求，支持SSL错误处理和连接诊断"""
-        if max_attempts is None:
-            max_attempts = Cfg().network.retry
-            
-        last_exception = None
-        
-        # 第一次失败时测试基础连接
-        connection_tested = False
-        
-        for attempt in range(max_attempts):
-            try:
-                # 添加随机延迟避免被检测
-                if attempt > 0:
-                    delay = random.uniform(1.0, 3.0) * (attempt + 1)
-                    time.sleep(delay)
-                    logger.debug(f'javbus2: 重试请求 ({attempt + 1}/{max_attempts}): {url}')
-                
-                # 使用随机头部
-                headers = self.get_random_headers()
-                
-                response = self.session.get(
-                    url, 
-                    headers=headers,
-                    timeout=Cfg().network.timeout.total_seconds(),
-                    allow_redirects=True
-                )
-                
-                # 检查响应状态
-                if response.status_code == 200:
-                    return response
-                elif response.status_code == 404:
-                    # 404错误不需要重试，直接抛出MovieNotFoundError
-                    raise MovieNotFoundError(__name__, url.split('/')[-1])
-                elif response.status_code in [403, 503]:
-                    logger.warning(f'javbus2: 访问被阻止 ({response.status_code}): {url}')
-                    if attempt == max_attempts - 1:
-                        raise SiteBlocked(f'javbus2: {response.status_code} 访问被阻止: {url}')
-                else:
-                    response.raise_for_status()
-                    
-            except (ssl.SSLError, requests.exceptions.SSLError) as e:
-                last_exception = e
-                logger.debug(f'javbus2: SSL错误 ({attempt + 1}/{max_attempts}): {e}')
-                if attempt == max_attempts - 1:
-                    raise requests.exceptions.RequestException(f'javbus2: SSL连接失败: {e}')
-                    
-            except requests.exceptions.RequestException as e:
-                last_exception = e
-                # 在第一次网络错误时测试基础连接
-                if not connection_tested and attempt == 0:
-                    connection_tested = True
-                    conn_ok, conn_result = self.test_connection()
-                    if not conn_ok:
-                        logger.warning(f'javbus2: 基础连接测试失败: {conn_result}')
-                        if 'proxy' in str(conn_result).lower():
-                            logger.warning('javbus2: 可能的代理连接问题，请检查代理设置')
-                
-                logger.debug(f'javbus2: 网络错误 ({attempt + 1}/{max_attempts}): {e}')
-                if attempt == max_attempts - 1:
-                    raise
-                    
-            except Exception as e:
-                last_exception = e
-                logger.debug(f'javbus2: 未知错误 ({attempt + 1}/{max_attempts}): {e}')
-                if attempt == max_attempts - 1:
-                    raise
-        
-        # 如果所有重试都失败，抛出最后一个异常
-        if last_exception:
-            raise last_exception
+    def get_with_retry(self, url, stream=False):
+        """发送GET请求（重试由适配器上的urllib3 Retry负责），并将响应状态映射为对应的异常"""
+        try:
+            response = self.session.get(
+                url,
+                headers=self.get_random_headers(),
+                timeout=self._timeout,
+                allow_redirects=True,
+                stream=stream
+            )
+        except requests.exceptions.SSLError as e:
+            raise requests.exceptions.RequestException(f'javbus2: SSL连接失败: {e}')
+        except requests.exceptions.RequestException as e:
+            # 测试基础连接可以帮助判断问题出在哪里，但会额外发出一个请求，因此只在调试时进行，且只测试一次
+            if logger.isEnabledFor(logging.DEBUG) and not self._connection_tested:
+                self._connection_tested = True
+                conn_ok, conn_result = self.test_connection()
+                if not conn_ok:
+                    logger.warning(f'javbus2: 基础连接测试失败: {conn_result}')
+                    if 'proxy' in str(conn_result).lower():
+                        logger.warning('javbus2: 可能的代理连接问题，请检查代理设置')
+            logger.debug(f'javbus2: 网络错误: {e}')
+            raise
+
+        # 检查响应状态（适配器重试耗尽后会返回最后一次的响应而不是抛出异常）
+        if response.status_code != 200:
+            # 出错时不会再读取响应体，及时关闭以将连接归还给连接池
+            response.close()
+        if response.status_code == 404:
+            raise MovieNotFoundError(__name__, url.split('/')[-1])
+        elif response.status_code in [403, 503]:
+            logger.warning(f'javbus2: 访问被阻止 ({response.status_code}): {url}')
+            raise SiteBlocked(f'javbus2: {response.status_code} 访问被阻止: {url}')
+        response.raise_for_status()
+        return response
 
 
-def normalize_dvdid(dvdid):
-    """标准化番号格式，去除多余的前导零
-    例如: RBD-00841 -> RBD-841, MIDE-00443 -> MIDE-443
+_DVDID_RE = re.compile(r'^([A-Za-z]+)-(\d+)$')
+
+def normalize_dvdid(dvdid, pad=0):
+    """标准化番号格式，去除多余的前导零，并将数字部分补齐到pad位
+    例如: RBD-00841 -> RBD-841, MIDE-00443 -> MIDE-443; pad=3时: ABC-1 -> ABC-001
     """
     if not dvdid:
         return dvdid
     
     # 使用正则表达式匹配番号格式: 字母-数字
-    match = re.match(r'^([A-Za-z]+)-(\d+)$', dvdid.strip())
+    match = _DVDID_RE.match(dvdid.strip())
     if match:
         prefix = match.group(1)
         number = match.group(2)
-        # 去除前导零，但保留至少一位数字
-        normalized_number = str(int(number))
+        # 去除前导零（但保留至少一位数字），然后补齐到指定位数
+        normalized_number = str(int(number)).zfill(pad)
         normalized_dvdid = f"{prefix}-{normalized_number}"
         
         if normalized_dvdid != dvdid:
@@ -224,33 +246,46 @@ def normalize_dvdid(dvdid):
     # 如果不匹配标准格式，返回原番号
     return dvdid
 
-def try_multiple_dvdid_formats(original_dvdid):
-    """标准化番号格式为 XXX-三位数字格式
-    返回标准化的番号字符串
+
+class RateLimiter:
+    """限制请求频率：多个线程共用时，保证相邻两次请求的开始时间至少间隔interval秒"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """阻塞直到允许发出下一个请求"""
+        # 只在锁内预约时间槽，等待过程在锁外进行，不会阻塞其他线程预约后续的时间槽
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _stream_html(resp: requests.Response):
+    """边接收边解析网页，使网络传输与解析交替进行，而不是等整个响应体下载完成后才开始解析
+
+    Returns:
+        lxml.html.HtmlElement: 网页的根元素
     """
-    if not original_dvdid:
-        return original_dvdid
-    
-    # 使用正则表达式匹配番号格式: 字母-数字
-    match = re.match(r'^([A-Za-z]+)-(\d+)$', original_dvdid.strip())
-    if match:
-        prefix = match.group(1)
-        number = match.group(2)
-        # 去除前导零，然后补齐到3位数字
-        normalized_number = str(int(number)).zfill(3)
-        standardized_dvdid = f"{prefix}-{normalized_number}"
-        
-        if standardized_dvdid != original_dvdid:
-            logger.debug(f'javbus2: 番号标准化: {original_dvdid} -> {standardized_dvdid}')
-        
-        return standardized_dvdid
-    
-    # 如果不匹配标准格式，返回原番号
-    return original_dvdid
+    # 解析器的feed接口带有解析状态，不能在线程间共用，因此每次请求单独创建
+    # JavBus的网页均为UTF-8编码，直接解析原始字节，省去先解码为str的过程
+    parser = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+    try:
+        for chunk in resp.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+    finally:
+        resp.close()
+    return parser.close()
 
 
 # 全局会话实例
 enhanced_session = EnhancedSession()
+rate_limiter = RateLimiter(MIN_REQUEST_INTERVAL)
 
 
 def parse_data(movie: MovieInfo):
@@ -259,7 +294,7 @@ def parse_data(movie: MovieInfo):
         movie (MovieInfo): 要解析的影片信息，解析后的信息直接更新到此变量内
     """
     original_dvdid = movie.dvdid
-    standardized_dvdid = try_multiple_dvdid_formats(original_dvdid)
+    standardized_dvdid = normalize_dvdid(original_dvdid, pad=3)
     
     logger.debug(f'javbus2: 开始抓取: {original_dvdid}，标准化格式: {standardized_dvdid}')
     
@@ -268,18 +303,23 @@ def parse_data(movie: MovieInfo):
     logger.debug(f'javbus2: 抓取URL: {url}')
     
     try:
-        resp = enhanced_session.get_with_retry(url)
+        resp = enhanced_session.get_with_retry(url, stream=True)
         
         # 处理可能的重定向到登录页面
         if resp.history and any('/doc/driver-verify' in r.url for r in resp.history):
             logger.debug('javbus2: 检测到driver验证页面，使用重定向前的响应')
             # 使用第一个重定向前的响应
+            resp.close()
             resp = resp.history[0]
         
-        html = resp2html(resp)
+        html = _stream_html(resp)
+        html.make_links_absolute(resp.url, resolve_base_href=True)
+        # 与resp2html一致：调试模式下在浏览器中打开解析后的网页
+        if hasattr(sys, 'javsp_debug_mode'):
+            lxml.html.open_in_browser(html, encoding='utf-8')
         
         # 检查是否为404页面
-        page_title = html.xpath('/html/head/title/text()')
+        page_title = _XP_PAGE_TITLE(html)
         if page_title and page_title[0].startswith('404 Page Not Found!'):
             logger.debug(f'javbus2: 番号 {standardized_dvdid} 返回404')
             raise MovieNotFoundError(__name__, standardized_dvdid)
@@ -300,7 +340,7 @@ def parse_data(movie: MovieInfo):
     # 如果成功找到页面，继续处理数据提取
     try:
         # 检查是否找到了影片容器
-        container_list = html.xpath("//div[@class='container']")
+        container_list = _XP_CONTAINER(html)
         if not container_list:
             logger.warning('javbus2: 未找到影片容器，可能页面结构变化')
             raise MovieNotFoundError(__name__, actual_dvdid)
@@ -308,14 +348,14 @@ def parse_data(movie: MovieInfo):
         container = container_list[0]
         
         # 提取标题
-        title_list = container.xpath("h3/text()")
+        title_list = _XP_TITLE(container)
         if not title_list:
             logger.warning('javbus2: 未找到影片标题')
             raise MovieNotFoundError(__name__, movie.dvdid)
         title = title_list[0]
         
         # 提取封面
-        cover_list = container.xpath("//a[@class='bigImage']/img/@src")
+        cover_list = _XP_COVER(container)
         if not cover_list:
             logger.warning('javbus2: 未找到封面图片')
             cover = None
@@ -323,19 +363,25 @@ def parse_data(movie: MovieInfo):
             cover = cover_list[0]
         
         # 提取预览图片
-        preview_pics = container.xpath("//div[@id='sample-waterfall']/a/@href")
+        preview_pics = _XP_PREVIEW_PICS(container)
         
         # 提取影片信息区域
-        info_list = container.xpath("//div[@class='col-md-3 info']")
+        info_list = _XP_INFO(container)
         if not info_list:
             logger.warning('javbus2: 未找到影片信息区域')
             raise MovieNotFoundError(__name__, movie.dvdid)
         info = info_list[0]
         
+        # 只遍历一次信息区域，建立 标签文本->标签元素 的映射，避免对每个字段都执行一次xpath查询
+        labels = {}
+        for span in info.iterfind('p/span'):
+            if span.text:
+                labels.setdefault(span.text, span)
+        
         # 提取番号
-        dvdid_elements = info.xpath("p/span[text()='識別碼:']")
-        if dvdid_elements:
-            parsed_dvdid = dvdid_elements[0].getnext().text
+        dvdid_label = labels.get('識別碼:')
+        if dvdid_label is not None:
+            parsed_dvdid = dvdid_label.getnext().text
             # 如果网页上的番号与我们使用的不同，记录一下，但优先使用我们找到的格式
             if parsed_dvdid != actual_dvdid:
                 logger.debug(f'javbus2: 网页显示番号: {parsed_dvdid}，使用的番号: {actual_dvdid}')
@@ -343,68 +389,61 @@ def parse_data(movie: MovieInfo):
             logger.warning(f'javbus2: 未找到識別碼标签，使用找到的番号: {actual_dvdid}')
         
         # 提取发布日期
-        date_elements = info.xpath("p/span[text()='發行日期:']")
-        if date_elements:
-            publish_date = date_elements[0].tail.strip()
+        date_label = labels.get('發行日期:')
+        if date_label is not None:
+            publish_date = date_label.tail.strip()
         else:
             publish_date = None
             logger.debug('javbus2: 未找到发布日期')
         
         # 提取时长
-        duration_elements = info.xpath("p/span[text()='長度:']")
-        if duration_elements:
-            duration = duration_elements[0].tail.replace('分鐘', '').strip()
+        duration_label = labels.get('長度:')
+        if duration_label is not None:
+            duration = duration_label.tail.replace('分鐘', '').strip()
         else:
             duration = None
             logger.debug('javbus2: 未找到影片时长')
         
         # 提取导演
-        director_tag = info.xpath("p/span[text()='導演:']")
-        if director_tag:
-            director_element = director_tag[0].getnext()
+        director_tag = labels.get('導演:')
+        if director_tag is not None:
+            director_element = director_tag.getnext()
             if director_element is not None:
                 movie.director = director_element.text.strip()
         
         # 提取制作商
-        producer_tag = info.xpath("p/span[text()='製作商:']")
-        if producer_tag:
-            producer_element = producer_tag[0].getnext()
+        producer_tag = labels.get('製作商:')
+        if producer_tag is not None:
+            producer_element = producer_tag.getnext()
             if producer_element is not None and producer_element.text:
                 movie.producer = producer_element.text.strip()
         
         # 提取发行商
-        publisher_tag = info.xpath("p/span[text()='發行商:']")
-        if publisher_tag:
-            publisher_element = publisher_tag[0].getnext()
+        publisher_tag = labels.get('發行商:')
+        if publisher_tag is not None:
+            publisher_element = publisher_tag.getnext()
             if publisher_element is not None:
                 movie.publisher = publisher_element.text.strip()
         
         # 提取系列
-        serial_tag = info.xpath("p/span[text()='系列:']")
-        if serial_tag:
-            serial_element = serial_tag[0].getnext()
+        serial_tag = labels.get('系列:')
+        if serial_tag is not None:
+            serial_element = serial_tag.getnext()
             if serial_element is not None:
                 movie.serial = serial_element.text
         
         # 提取类别和类别ID
-        genre_tags = info.xpath("//span[@class='genre']/label/a")
-        genre, genre_id = [], []
-        for tag in genre_tags:
-            tag_url = tag.get('href', '')
-            pre_id = tag_url.split('/')[-1] if tag_url else ''
-            genre_text = tag.text
-            if genre_text:
-                genre.append(genre_text)
-                if 'uncensored' in tag_url:
-                    movie.uncensored = True
-                    genre_id.append('uncensored-' + pre_id)
-                else:
-                    movie.uncensored = False
-                    genre_id.append(pre_id)
+        # 只保留有文本的类别；无码影片的类别链接中含有'uncensored'，据此判断影片是否为无码
+        genre_tags = [(tag.text, tag.get('href', '')) for tag in _XP_GENRE(info) if tag.text]
+        genre = [text for text, _ in genre_tags]
+        genre_id = [('uncensored-' if 'uncensored' in href else '') + href.rsplit('/', 1)[-1]
+                    for _, href in genre_tags]
+        if genre_tags:
+            movie.uncensored = any('uncensored' in href for _, href in genre_tags)
         
         # 提取女优信息
         actress, actress_pics = [], {}
-        actress_tags = html.xpath("//a[@class='avatar-box']/div/img")
+        actress_tags = _XP_ACTRESS(html)
         for tag in actress_tags:
             name = tag.get('title')
             pic_url = tag.get('src')
@@ -454,12 +493,42 @@ def parse_clean_data(movie: MovieInfo):
         raise
 
 
+def parse_many(movies: list[MovieInfo], workers: int = MAX_WORKERS) -> list[Exception | None]:
+    """使用线程池并发抓取并清洗多部影片的数据
+
+    JavBus的搜索/列表页中每部影片只有番号、标题、发行日期和缩略图，缺少封面、类别、女优等信息，
+    无法用一次列表请求代替多次详情页请求，因此批量抓取仍然是逐部请求详情页，只是并发进行
+
+    Args:
+        movies (list[MovieInfo]): 要抓取的影片列表，解析后的信息直接更新到各个变量内
+        workers (int): 并发线程数，超过MAX_WORKERS时按MAX_WORKERS处理（与连接池大小一致）
+
+    Returns:
+        list[Exception | None]: 与movies一一对应的抓取结果，成功时为None，失败时为对应的异常
+    """
+    def worker(movie: MovieInfo):
+        rate_limiter.wait()
+        try:
+            parse_clean_data(movie)
+        except Exception as e:
+            # parse_clean_data内部已经记录过失败日志，这里只需要收集异常，不影响其他影片的抓取
+            return e
+
+    workers = max(1, min(workers, MAX_WORKERS, len(movies)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, movies))
+
+
 if __name__ == "__main__":
     import pretty_errors
     pretty_errors.configure(display_link=True)
     
-    # 配置日志级别
-    logging.basicConfig(level=logging.DEBUG)
+    # 配置日志级别（控制台输出与failed.log一并配置）
+    setup_failed_log({
+        'formatters': {'basic': {'format': logging.BASIC_FORMAT}},
+        'handlers': {'console': {'class': 'logging.StreamHandler', 'formatter': 'basic'}},
+        'root': {'level': 'DEBUG', 'handlers': ['console']},
+    })
     
     # 测试用例 - 测试番号标准化功能
     movie = MovieInfo('RBD-00841')
@@ -16,6 +16,10 @@ file_dir = os.path.dirname(__file__)
 data_dir = os.path.abspath(os.path.join(file_dir, '../unittest/data'))
 sys.path.insert(0, os.path.abspath(os.path.join(file_dir, '..')))
 from javsp.datatype import MovieInfo
+from javsp.web.failed_log import setup_failed_log
+
+
+setup_failed_log()
 
 
 # 搜索抓取器并导入它们